@@ -118,3 +118,23 @@ def _check_field(field: str, current_value: int, min_value: int, max_value: int)
         return field_value == current_value
     except ValueError:
         raise ValueError(f"Invalid field value: {field}. Expected a number or *.")
+
+
+def cron_times(schedule: str) -> list:
+    """
+    List the times of day a cron schedule can fire at, ignoring its day fields.
+
+    Args:
+        schedule: A cron schedule string, in the same format as for check_cron
+
+    Returns:
+        Sorted list of (hour, minute) tuples matched by the hour and minute fields
+    """
+    parts = schedule.split()
+    if len(parts) != 5:
+        raise ValueError(f"Invalid cron schedule: {schedule}. Expected 5 parts.")
+
+    minute, hour = parts[0], parts[1]
+    minutes = [value for value in range(0, 60) if _check_field(minute, value, 0, 59)]
+    hours = [value for value in range(0, 24) if _check_field(hour, value, 0, 23)]
+    return [(h, m) for h in hours for m in minutes]
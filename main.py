@@ -24,21 +24,11 @@ def check_day_of_week(event_date: datetime.date, day_of_week: int) -> bool:
     return event_date.isoweekday() == day_of_week
 
 
-def email_cloud_function(event, context):
-    # Messages in pubsub are base64 encoded. Also support events with the keys directly in them, to make testing easier
-    if 'data' in event:
-        event = json.loads(base64.b64decode(event['data']).decode('utf-8'))
-        results = []
-        for reminder in event['reminders']:
-            result = process_reminder(reminder, context)
-            results.append(result)
-        return results
-    else:
-        print("WARNING! received empty event")
-
-
-def process_reminder(event, context):
-    event_timestamp = parser.parse(context.timestamp)
+def scheduled_timestamp(event, event_timestamp: datetime.datetime) -> datetime.datetime:
+    # Flexible reminders are delayed by a fixed number of minutes, so evaluate the schedule at the time they
+    # would have fired without the offset. The offset is subtracted before converting to the reminder's timezone,
+    # so that a delay across a daylight saving change still sends exactly once
+    event_timestamp = event_timestamp - datetime.timedelta(minutes=event.get('offset_minutes', 0))
     timezone = event.get('timezone')
     
     if timezone:
@@ -49,29 +39,54 @@ def process_reminder(event, context):
             event_timestamp = pytz.timezone('UTC').localize(event_timestamp)
             event_timestamp = event_timestamp.astimezone(pytz.timezone(timezone))
     
-    normalized_timestamp = event_timestamp.replace(second=0, microsecond=0)
+    return event_timestamp.replace(second=0, microsecond=0)
+
+
+def should_send(event, normalized_timestamp: datetime.datetime) -> bool:
     event_date = normalized_timestamp.date()
-    
+
     if 'cron_schedule' in event:
         cron_schedule = event['cron_schedule']
         if not check_cron(cron_schedule, normalized_timestamp.replace(tzinfo=None)):
             # for debugging
             # print(f"Skipping {event['subject']}: Schedule: {cron_schedule}. Now: {normalized_timestamp}")
-            return "Skipped"
+            return False
         else:
             # print(f"Sending {event['subject']}: Schedule: {cron_schedule}. Now: {normalized_timestamp}")
             pass
 
     if 'required_day_of_week' in event:
         if not check_day_of_week(event_date, event['required_day_of_week']):
-            return "Skipped"
+            return False
 
     if 'schedule' in event:
         schedule = event['schedule']
         assert schedule['unit'] == 'day'
         start_date = datetime.date.fromisoformat(schedule['start'])
         if not check_ndays_schedule(start_date, event_date, schedule['frequency']):
-            return "Skipped"
+            return False
+
+    return True
+
+
+def email_cloud_function(event, context):
+    # Messages in pubsub are base64 encoded. Also support events with the keys directly in them, to make testing easier
+    if 'data' in event:
+        event = json.loads(base64.b64decode(event['data']).decode('utf-8'))
+        results = []
+        for reminder in event['reminders']:
+            result = process_reminder(reminder, context)
+            results.append(result)
+        return results
+    else:
+        print("WARNING! received empty event")
+
+
+def process_reminder(event, context):
+    normalized_timestamp = scheduled_timestamp(event, parser.parse(context.timestamp))
+
+    if not should_send(event, normalized_timestamp):
+        return "Skipped"
 
     event_timestamp = parser.parse(context.timestamp)
     event_age = (datetime.datetime.now(datetime.timezone.utc) - event_timestamp).total_seconds()
@@ -0,0 +1,163 @@
+import argparse
+import collections
+import datetime
+import sys
+import typing
+import yaml
+from dateutil import parser
+
+from cron import cron_times
+from main import should_send
+from update_reminders import build_payloads
+
+
+def send_histogram(payloads: list, start: datetime.datetime, end: datetime.datetime) -> collections.Counter:
+    """
+    Count how many reminders would be sent by each invocation of the combined job.
+
+    The simulation uses naive local time in the config's timezone, so around daylight saving changes the counts
+    are approximate: offsets are added to wall-clock time, and skipped or repeated local hours are not modelled.
+
+    Args:
+        payloads: Reminder payloads, as built by update_reminders.build_payloads
+        start: First minute to simulate, as a naive datetime in the config's timezone
+        end: Last minute to simulate (inclusive), as a naive datetime in the config's timezone
+
+    Returns:
+        Counter mapping each minute that sends at least one reminder to the number of reminders sent
+    """
+    histogram = collections.Counter()
+    start = start.replace(second=0, microsecond=0)
+    for payload in payloads:
+        offset = datetime.timedelta(minutes=payload.get('offset_minutes', 0))
+        times = cron_times(payload['cron_schedule'])
+        # Only the instants matching the minute and hour fields can send, so check those instead of every minute.
+        # Start early enough to include sends scheduled before the period but delayed into it
+        day = (start - offset).date()
+        while day <= end.date():
+            for hour, minute in times:
+                scheduled = datetime.datetime.combine(day, datetime.time(hour, minute))
+                current = scheduled + offset
+                if start <= current <= end and should_send(payload, scheduled):
+                    histogram[current] += 1
+            day += datetime.timedelta(days=1)
+    return histogram
+
+
+def suggest_jitter_minutes(config: dict, start: datetime.datetime, end: datetime.datetime, target: int,
+                           max_jitter_minutes: int) -> typing.Optional[int]:
+    """
+    Find the smallest jitter window that keeps every invocation at or below the target.
+
+    Offsets are a hash of each reminder, so a larger window doesn't always give a lower peak, and every window up
+    to max_jitter_minutes is tried in turn.
+
+    Returns:
+        The smallest jitter_minutes that meets the target, or None if none of them do
+    """
+    fixed_config = dict(config, recipients=[])
+    flexible_config = dict(config, recipients=[])
+    for recipient in config['recipients']:
+        fixed_config['recipients'].append(dict(recipient, reminders=[
+            reminder for reminder in recipient['reminders'] if not reminder.get('flexible', False)]))
+        flexible_config['recipients'].append(dict(recipient, reminders=[
+            reminder for reminder in recipient['reminders'] if reminder.get('flexible', False)]))
+
+    # Only the flexible reminders move, so the rest of the histogram is computed once
+    fixed = send_histogram(build_payloads(fixed_config), start, end)
+    if max(fixed.values(), default=0) > target:
+        return None
+    for jitter_minutes in range(0, max_jitter_minutes + 1):
+        flexible = send_histogram(build_payloads(dict(flexible_config, jitter_minutes=jitter_minutes)), start, end)
+        if max((fixed + flexible).values(), default=0) <= target:
+            return jitter_minutes
+    return None
+
+
+def print_report(title: str, histogram: collections.Counter, top: int):
+    print(title)
+    if not histogram:
+        print("  No reminders sent")
+        return
+    total_sends = sum(histogram.values())
+    print(f"  Total sends: {total_sends} across {len(histogram)} invocations")
+    print(f"  Peak sends per invocation: {max(histogram.values())}")
+
+    by_time_of_day = collections.Counter()
+    for minute, count in histogram.items():
+        by_time_of_day[minute.strftime('%H:%M')] += count
+    print("  Busiest times of day:")
+    for time_of_day, count in by_time_of_day.most_common(top):
+        print(f"    {time_of_day}  {count}")
+
+    print("  Peak minutes:")
+    for minute, count in sorted(histogram.items(), key=lambda item: (-item[1], item[0]))[:top]:
+        print(f"    {minute.strftime('%Y-%m-%d %H:%M %a')}  {count}")
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Report the number of reminders sent per invocation")
+    arg_parser.add_argument('config', nargs='?', help="Reminders config (default: reminders.yaml, or example.yaml)")
+    arg_parser.add_argument('--start', help="First day to simulate, in the config's timezone (default: today)")
+    arg_parser.add_argument('--days', type=int, default=365, help="Number of days to simulate")
+    arg_parser.add_argument('--top', type=int, default=10, help="Number of peak minutes to report")
+    arg_parser.add_argument('--jitter-minutes', type=int,
+                            help="Smoothing window for flexible reminders (overrides jitter_minutes in the config)")
+    arg_parser.add_argument('--target', type=int,
+                            help="Exit with an error if any invocation sends more than this, and suggest the smallest "
+                                 "jitter_minutes that meets it. This is only a check: flexible reminders are spread by "
+                                 "a hash of the reminder, not to meet the target")
+    arg_parser.add_argument('--max-jitter-minutes', type=int, default=120,
+                            help="Largest jitter_minutes to try when suggesting one for --target")
+    args = arg_parser.parse_args(argv)
+
+    if args.config:
+        yaml_file = args.config
+    else:
+        try:
+            with open('reminders.yaml', 'r'):
+                yaml_file = 'reminders.yaml'
+        except FileNotFoundError:
+            yaml_file = 'example.yaml'
+    with open(yaml_file, 'r') as f:
+        config = yaml.safe_load(f)
+    print(f"Using schedules from {yaml_file}")
+
+    if args.start:
+        # The simulation runs in naive local time, so any timezone in the argument is ignored
+        start = parser.parse(args.start).replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+    else:
+        start = datetime.datetime.combine(datetime.date.today(), datetime.time())
+    end = start + datetime.timedelta(days=args.days) - datetime.timedelta(minutes=1)
+    print(f"Simulating {start} to {end} ({config['timezone']})\n")
+
+    unsmoothed_config = dict(config, jitter_minutes=0)
+    unsmoothed = send_histogram(build_payloads(unsmoothed_config), start, end)
+    print_report("Without smoothing", unsmoothed, args.top)
+    peak = max(unsmoothed.values(), default=0)
+
+    smoothed_config = dict(config)
+    if args.jitter_minutes is not None:
+        smoothed_config['jitter_minutes'] = args.jitter_minutes
+    if (smoothed_config.get('jitter_minutes') or 0) > 0:
+        flexible = sum(1 for recipient in config['recipients']
+                       for reminder in recipient['reminders'] if reminder.get('flexible', False))
+        print()
+        smoothed = send_histogram(build_payloads(smoothed_config), start, end)
+        print_report(f"With smoothing ({flexible} flexible reminders, "
+                     f"jitter window {smoothed_config['jitter_minutes']} minutes)", smoothed, args.top)
+        peak = max(smoothed.values(), default=0)
+
+    if args.target is not None and peak > args.target:
+        print(f"\nPeak of {peak} sends per invocation exceeds target of {args.target}")
+        jitter_minutes = suggest_jitter_minutes(config, start, end, args.target, args.max_jitter_minutes)
+        if jitter_minutes is None:
+            print(f"No jitter_minutes up to {args.max_jitter_minutes} meets the target with the current flexible "
+                  f"reminders")
+        else:
+            print(f"Smallest jitter_minutes that meets the target: {jitter_minutes}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,4 @@
+source virtualenv/bin/activate
+pip install -r requirements.txt > /dev/null
+pip install -r update_reminders_requirements.txt > /dev/null
+GCP_PROJECT="test" GCP_REGION="test" python peak_load.py "$@"
\ No newline at end of file
@@ -0,0 +1,89 @@
+import contextlib
+import datetime
+import io
+import os
+import tempfile
+import unittest
+
+import yaml
+
+from peak_load import send_histogram, suggest_jitter_minutes, main
+from update_reminders import build_payloads
+
+
+CONFIG = {'from': 'reminders@example.com',
+          'timezone': 'UTC',
+          'recipients': [{'to': 'user@example.com',
+                          'reminders': [{'subject': 'Fixed', 'schedule': '0 5 * * *'},
+                                        {'subject': 'Flexible 1', 'schedule': '0 5 * * *', 'flexible': True},
+                                        {'subject': 'Flexible 2', 'schedule': '0 5 * * *', 'flexible': True}]}]}
+
+START = datetime.datetime(2025, 1, 1)
+END = datetime.datetime(2025, 1, 2, 23, 59)
+
+
+class PeakLoadTestCase(unittest.TestCase):
+    def test_histogram_without_smoothing(self):
+        histogram = send_histogram(build_payloads(CONFIG), START, END)
+        self.assertEqual(histogram, {datetime.datetime(2025, 1, 1, 5, 0): 3,
+                                     datetime.datetime(2025, 1, 2, 5, 0): 3})
+
+    def test_histogram_with_smoothing(self):
+        config = dict(CONFIG, jitter_minutes=30)
+        histogram = send_histogram(build_payloads(config), START, END)
+        self.assertEqual(max(histogram.values()), 1)
+        # Offsets are flexible_offset('user@example.com', subject, 30)
+        for day in (1, 2):
+            self.assertEqual(histogram[datetime.datetime(2025, 1, day, 5, 0)], 1)
+            self.assertEqual(histogram[datetime.datetime(2025, 1, day, 5, 30)], 1)
+            self.assertEqual(histogram[datetime.datetime(2025, 1, day, 5, 25)], 1)
+        self.assertEqual(sum(histogram.values()), 6)
+
+    def test_histogram_includes_delayed_sends_from_before_start(self):
+        config = dict(CONFIG, jitter_minutes=30)
+        histogram = send_histogram(build_payloads(config), datetime.datetime(2025, 1, 1, 5, 10), END)
+        self.assertEqual(histogram[datetime.datetime(2025, 1, 1, 5, 30)], 1)
+        self.assertEqual(histogram[datetime.datetime(2025, 1, 1, 5, 25)], 1)
+        self.assertEqual(histogram[datetime.datetime(2025, 1, 1, 5, 0)], 0)
+
+    def test_suggest_jitter_minutes(self):
+        self.assertEqual(suggest_jitter_minutes(CONFIG, START, END, 3, 60), 0)
+        # The smallest window where the flexible reminders move off 05:00 and away from each other
+        jitter_minutes = suggest_jitter_minutes(CONFIG, START, END, 1, 60)
+        self.assertIsNotNone(jitter_minutes)
+        config = dict(CONFIG, jitter_minutes=jitter_minutes)
+        self.assertEqual(max(send_histogram(build_payloads(config), START, END).values()), 1)
+        for smaller in range(jitter_minutes):
+            config = dict(CONFIG, jitter_minutes=smaller)
+            self.assertGreater(max(send_histogram(build_payloads(config), START, END).values()), 1)
+
+        self.assertIsNone(suggest_jitter_minutes(CONFIG, START, END, 0, 60))
+
+    def test_start_with_timezone(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'reminders.yaml')
+            with open(path, 'w') as f:
+                yaml.safe_dump(CONFIG, f)
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                main([path, '--start', '2025-01-01T00:00+02:00', '--days', '2'])
+            self.assertIn("Simulating 2025-01-01 00:00:00 to 2025-01-02 23:59:00", output.getvalue())
+
+    def test_target(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'reminders.yaml')
+            with open(path, 'w') as f:
+                yaml.safe_dump(CONFIG, f)
+            args = [path, '--start', '2025-01-01', '--days', '2']
+
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                with self.assertRaises(SystemExit) as context:
+                    main(args + ['--target', '2'])
+                self.assertEqual(context.exception.code, 1)
+                self.assertIn("Smallest jitter_minutes that meets the target: ", output.getvalue())
+
+                main(args + ['--target', '3'])
+                main(args + ['--target', '1', '--jitter-minutes', '30'])
+
+
+if __name__ == '__main__':
+    unittest.main()
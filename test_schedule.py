@@ -2,8 +2,8 @@ import datetime
 import unittest
 from dateutil import parser, tz
 
-from main import check_ndays_schedule, check_day_of_week
-from update_reminders import parse_schedule
+from main import check_ndays_schedule, check_day_of_week, should_send, scheduled_timestamp
+from update_reminders import parse_schedule, flexible_offset, build_payloads
 
 
 class ScheduleTestCase(unittest.TestCase):
@@ -39,6 +39,60 @@ class ScheduleTestCase(unittest.TestCase):
         self.assertEqual(schedule, {})
         self.assertEqual(day_of_week, 2)
 
+    def test_flexible_offset(self):
+        offset = flexible_offset("user@example.com", "Reminder", 30)
+        self.assertEqual(offset, flexible_offset("user@example.com", "Reminder", 30))
+        self.assertTrue(0 <= offset <= 30)
+        self.assertEqual(flexible_offset("user@example.com", "Reminder", 0), 0)
+
+        offsets = {flexible_offset("user@example.com", f"Reminder {i}", 30) for i in range(20)}
+        self.assertGreater(len(offsets), 1)
+
+    def test_build_payloads_smoothing(self):
+        config = {'from': 'reminders@example.com',
+                  'timezone': 'UTC',
+                  'recipients': [{'to': 'user@example.com',
+                                  'reminders': [{'subject': 'Fixed', 'schedule': '0 5 * * *'},
+                                                {'subject': 'Flexible', 'schedule': '0 5 * * *', 'flexible': True}]}]}
+        payloads = build_payloads(config)
+        self.assertNotIn('offset_minutes', payloads[0])
+        self.assertNotIn('offset_minutes', payloads[1])
+
+        config['jitter_minutes'] = 30
+        payloads = build_payloads(config)
+        self.assertNotIn('offset_minutes', payloads[0])
+        self.assertEqual(payloads[1]['offset_minutes'], flexible_offset('user@example.com', 'Flexible', 30))
+
+    def test_should_send_with_offset(self):
+        event = {'cron_schedule': '50 23 * * *', 'required_day_of_week': 6, 'offset_minutes': 20}
+        # Scheduled for Saturday 23:50, delayed into Sunday
+        self.assertFalse(should_send(event, scheduled_timestamp(event, datetime.datetime(2022, 6, 25, 23, 50))))
+        self.assertTrue(should_send(event, scheduled_timestamp(event, datetime.datetime(2022, 6, 26, 0, 10))))
+        self.assertFalse(should_send(event, scheduled_timestamp(event, datetime.datetime(2022, 6, 27, 0, 10))))
+
+        del event['offset_minutes']
+        self.assertTrue(should_send(event, scheduled_timestamp(event, datetime.datetime(2022, 6, 25, 23, 50))))
+
+    def _send_times(self, event, day):
+        # Invocations happen every minute in UTC, so simulate a full UTC day around the local one
+        sends = []
+        current = datetime.datetime.combine(day, datetime.time()).replace(tzinfo=tz.UTC)
+        for _ in range(2 * 24 * 60):
+            if should_send(event, scheduled_timestamp(event, current)):
+                sends.append(current)
+            current += datetime.timedelta(minutes=1)
+        return sends
+
+    def test_offset_across_daylight_saving(self):
+        # Delayed into the hour that is skipped when clocks go forward
+        event = {'cron_schedule': '50 1 8 3 *', 'timezone': 'America/Los_Angeles', 'offset_minutes': 20}
+        self.assertEqual(self._send_times(event, datetime.date(2026, 3, 8)),
+                         [parser.parse("2026-03-08T10:10Z")])
+
+        # Delayed into the hour that is repeated when clocks go back
+        event = {'cron_schedule': '50 0 1 11 *', 'timezone': 'America/Los_Angeles', 'offset_minutes': 20}
+        self.assertEqual(self._send_times(event, datetime.date(2026, 11, 1)),
+                         [parser.parse("2026-11-01T08:10Z")])
 
 if __name__ == '__main__':
     unittest.main()
@@ -77,27 +77,51 @@ def parse_schedule(schedule: str) -> (str, dict, typing.Optional[int]):
     return schedule, {}, None
 
 
-def read_reminders(client: CloudSchedulerClient) -> Job:
+def flexible_offset(recipient: str, subject: str, jitter_minutes: int) -> int:
+    """
+    Deterministic delay, in minutes, for a flexible reminder. Derived from a hash of the reminder, so that it
+    stays stable across updates. Different reminders can still get the same offset, including 0.
+    """
+    if jitter_minutes <= 0:
+        return 0
+    hasher = hashlib.sha1()
+    hasher.update(f'{recipient}\n{subject}'.encode('utf-8'))
+    return int(hasher.hexdigest(), 16) % (jitter_minutes + 1)
+
+
+def build_payloads(config: dict) -> list:
     all_payloads = []
-    
+    # Smoothing is opt-in: reminders marked as flexible are only spread out if the config sets a jitter window
+    jitter_minutes = int(config.get('jitter_minutes') or 0)
+
+    for recipient in config['recipients']:
+        for reminder in recipient['reminders']:
+            cron, extra_schedule, day_of_week = parse_schedule(reminder['schedule'])
+            # Make sure the schedule is valid
+            validate_cron(cron)
+            payload = {'from': config['from'],
+                       'to': recipient['to'],
+                       'subject': reminder['subject'],
+                       'html_content': reminder.get('html_content'),
+                       'cron_schedule': cron,
+                       'timezone': config['timezone']}
+            if extra_schedule:
+                payload['schedule'] = extra_schedule
+            if day_of_week is not None:
+                payload['required_day_of_week'] = day_of_week
+            if reminder.get('flexible', False):
+                offset = flexible_offset(recipient['to'], reminder['subject'], jitter_minutes)
+                if offset:
+                    payload['offset_minutes'] = offset
+            all_payloads.append(payload)
+
+    return all_payloads
+
+
+def read_reminders(client: CloudSchedulerClient) -> Job:
     with open('reminders.yaml', 'r') as f:
         config = yaml.safe_load(f)
-        for recipient in config['recipients']:
-            for reminder in recipient['reminders']:
-                cron, extra_schedule, day_of_week = parse_schedule(reminder['schedule'])
-                # Make sure the schedule is valid
-                validate_cron(cron)
-                payload = {'from': config['from'],
-                           'to': recipient['to'],
-                           'subject': reminder['subject'],
-                           'html_content': reminder.get('html_content'),
-                           'cron_schedule': cron,
-                           'timezone': config['timezone']}
-                if extra_schedule:
-                    payload['schedule'] = extra_schedule
-                if day_of_week is not None:
-                    payload['required_day_of_week'] = day_of_week
-                all_payloads.append(payload)
+    all_payloads = build_payloads(config)
     
     combined_payload = {'reminders': all_payloads}
     data = json.dumps(combined_payload).encode('utf-8')